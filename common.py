@@ -11,6 +11,16 @@ import re
 from datetime import datetime
 from typing import Optional
 
+# Compiled once at import time; strip_ansi runs for every table cell rendered
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+# Checked once at import time; terminal_link runs for every rendered link
+_NO_HYPERLINKS = os.environ.get('NO_HYPERLINKS') == '1'
+
+# OSC 8 hyperlink template, filled in per link (%-formatting is the
+# cheapest way to interpolate into a precomputed template)
+_OSC8_LINK = '\033]8;;%s\033\\%s\033]8;;\033\\'
+
 
 class Colors:
     """ANSI color codes for terminal output"""
@@ -41,9 +51,9 @@ def terminal_link(url: str, text: str) -> str:
     
     Can be disabled by setting NO_HYPERLINKS=1 environment variable
     """
-    if os.environ.get('NO_HYPERLINKS') == '1':
+    if _NO_HYPERLINKS:
         return text
-    return f'\033]8;;{url}\033\\{text}\033]8;;\033\\'
+    return _OSC8_LINK % (url, text)
 
 
 def format_deployment_link(ipfs_hash: str, subgraph_id: Optional[str] = None) -> str:
@@ -64,13 +74,19 @@ def format_tokens(tokens: str) -> str:
         Formatted string like "1,234,567 GRT"
     """
     try:
-        amount = float(tokens) / 1e18
-        if amount >= 1:
-            return f"{amount:,.0f} GRT"
-        elif amount > 0:
-            return f"{amount:.2f} GRT"
-        elif amount < 0:
-            return f"{amount:,.0f} GRT"
+        # Pure integer path: exact for amounts beyond float precision (2^53 wei)
+        try:
+            wei = int(tokens)
+        except (TypeError, ValueError):
+            wei = int(float(tokens))  # callers sometimes pass str(float)
+        sign = '-' if wei < 0 else ''
+        whole, frac = divmod(abs(wei), 10 ** 18)
+        if whole >= 1:
+            if frac >= 5 * 10 ** 17:
+                whole += 1
+            return f"{sign}{whole:,} GRT"
+        elif wei > 0:
+            return f"{wei / 1e18:.2f} GRT"
         else:
             return "0 GRT"
     except:
@@ -87,15 +103,21 @@ def format_tokens_short(tokens: str) -> str:
         Formatted string like "1.2M" or "456k"
     """
     try:
-        amount = float(tokens) / 1e18
-        if amount >= 1_000_000:
-            return f"{amount/1_000_000:.1f}M"
-        elif amount >= 1_000:
-            return f"{amount/1_000:.0f}k"
-        elif amount >= 1:
-            return f"{amount:,.0f}"
+        try:
+            wei = int(tokens)
+        except (TypeError, ValueError):
+            wei = int(float(tokens))
+        whole, frac = divmod(wei, 10 ** 18)
+        if whole >= 1_000_000:
+            return f"{wei / 1e24:.1f}M"
+        elif whole >= 1_000:
+            return f"{wei / 1e21:.0f}k"
+        elif whole >= 1:
+            if frac >= 5 * 10 ** 17:
+                whole += 1
+            return f"{whole:,}"
         else:
-            return f"{amount:.2f}"
+            return f"{wei / 1e18:.2f}"
     except:
         return "0"
 
@@ -109,7 +131,8 @@ def format_timestamp(ts: str) -> str:
     """Format Unix timestamp to readable date string"""
     try:
         dt = datetime.fromtimestamp(int(ts))
-        return dt.strftime('%Y-%m-%d %H:%M')
+        # Direct f-string formatting skips strftime's format-string parse
+        return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
     except:
         return 'Unknown'
 
@@ -126,11 +149,11 @@ def format_duration(seconds: float) -> str:
     seconds = int(seconds)
     if seconds < 0:
         return "expired"
-    
-    days = seconds // 86400
-    hours = (seconds % 86400) // 3600
-    minutes = (seconds % 3600) // 60
-    
+
+    days, rem = divmod(seconds, 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes = rem // 60
+
     if days > 0:
         return f"{days}d {hours}h"
     elif hours > 0:
@@ -155,11 +178,16 @@ def print_section(title: str, colors: type = Colors):
 
 def strip_ansi(text: str) -> str:
     """Remove ANSI color codes from text"""
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    return ansi_escape.sub('', text)
+    # One C-level membership test beats running the regex on plain text
+    if '\x1b' not in text:
+        return text
+    return _ANSI_RE.sub('', text)
 
 
 def get_display_width(text: str) -> int:
     """Get display width of text without ANSI codes"""
+    # Fast path: most cells contain no escape sequences at all
+    if '\x1b' not in text:
+        return len(text)
     return len(strip_ansi(text))
 
@@ -7,6 +7,7 @@ This module handles loading configuration from:
 2. Config file at ~/.grtinfo/config.json
 """
 
+import functools
 import os
 import sys
 import json
@@ -17,8 +18,13 @@ from typing import Optional
 CONFIG_FILE = Path.home() / '.grtinfo' / 'config.json'
 
 
+@functools.lru_cache(maxsize=1)
 def _load_config() -> dict:
-    """Load config file, returns empty dict on error"""
+    """Load config file, returns empty dict on error
+
+    Cached for the lifetime of the process: a single CLI run asks for
+    several URLs and should not re-read and re-parse the file each time.
+    """
     if not CONFIG_FILE.exists():
         return {}
     
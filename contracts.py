@@ -34,7 +34,7 @@ HORIZON_REWARD_ASSIGNED_TOPIC = "0xa111914d7f2ea8beca61d12f1a1f38c5533de5f1823c3
 # =============================================================================
 
 # RewardsManager.getRewards(address _rewardsIssuer, address _allocationID) returns (uint256)
-GET_REWARDS_SELECTOR = "0x0e6f0a5e"
+GET_REWARDS_SELECTOR = "0x779bcb9b"
 
 # Staking.getDelegation(address _indexer, address _delegator) returns (uint256 shares, uint256 tokensLocked, uint256 tokensLockedUntil)
 GET_DELEGATION_SELECTOR = "0x15049a5a"
@@ -99,90 +99,3 @@ def pad_address(address: str) -> str:
         addr = addr[2:]
     return '0x' + addr.zfill(64)
 
-
-# =============================================================================
-# HorizonStakingClient - Workaround for subgraph tokenCapacity bug
-# =============================================================================
-# Issue: https://github.com/graphprotocol/graph-network-subgraph/issues/323
-#
-# The subgraph's tokenCapacity can be stale because delegationExchangeRate
-# is not updated when rewards accumulate in the delegation pool. This client
-# fetches the accurate value directly from the HorizonStaking contract.
-
-import requests
-from typing import Optional
-
-
-class HorizonStakingClient:
-    """Client for fetching staking data directly from the HorizonStaking contract.
-
-    This is a workaround for the subgraph's tokenCapacity being out of sync
-    with the contract's getTokensAvailable value.
-    """
-
-    def __init__(self, rpc_url: str):
-        self.rpc_url = rpc_url
-        self._delegation_ratio: Optional[int] = None
-
-    def _eth_call(self, to: str, data: str) -> Optional[str]:
-        """Make an eth_call to the contract."""
-        payload = {
-            "jsonrpc": "2.0",
-            "method": "eth_call",
-            "params": [{"to": to, "data": data}, "latest"],
-            "id": 1,
-        }
-        try:
-            response = requests.post(self.rpc_url, json=payload, timeout=10)
-            response.raise_for_status()
-            result = response.json()
-            if "error" in result:
-                return None
-            return result.get("result")
-        except requests.RequestException:
-            return None
-
-    def _encode_address(self, address: str) -> str:
-        """Encode an address as a 32-byte hex string."""
-        return address.lower().replace("0x", "").zfill(64)
-
-    def _encode_uint32(self, value: int) -> str:
-        """Encode a uint32 as a 32-byte hex string."""
-        return hex(value)[2:].zfill(64)
-
-    def _decode_uint256(self, hex_data: str) -> int:
-        """Decode a uint256 from hex string."""
-        if not hex_data or hex_data == "0x":
-            return 0
-        return int(hex_data, 16)
-
-    def get_delegation_ratio(self) -> int:
-        """Get the delegation ratio from the SubgraphService contract."""
-        if self._delegation_ratio is not None:
-            return self._delegation_ratio
-
-        result = self._eth_call(SUBGRAPH_SERVICE, GET_DELEGATION_RATIO_SELECTOR)
-        if result:
-            self._delegation_ratio = self._decode_uint256(result)
-            return self._delegation_ratio
-        return 16  # Default fallback
-
-    def get_tokens_available(self, indexer_address: str) -> Optional[int]:
-        """Get the tokens available for an indexer from the contract.
-
-        Returns the value in wei (not GRT), or None if the call fails.
-        """
-        delegation_ratio = self.get_delegation_ratio()
-
-        data = (
-            GET_TOKENS_AVAILABLE_SELECTOR
-            + self._encode_address(indexer_address)
-            + self._encode_address(SUBGRAPH_SERVICE)
-            + self._encode_uint32(delegation_ratio)
-        )
-
-        result = self._eth_call(STAKING, data)
-        if result:
-            return self._decode_uint256(result)
-        return None
-
@@ -37,6 +37,7 @@ from common import (
 from config import get_network_subgraph_url, get_ens_subgraph_url, get_analytics_subgraph_url
 from ens_client import ENSClient
 from contracts import REWARDS_MANAGER, STAKING, SUBGRAPH_SERVICE, GRT_DECIMALS
+from rewards import get_indexer_reward_cuts
 from logger import setup_logging, get_logger
 
 log = get_logger(__name__)
@@ -202,6 +203,43 @@ class TheGraphClient:
         result = self.query(query, {'id': indexer_id.lower()})
         return result.get('indexer')
 
+    def get_indexers_details(self, indexer_ids: List[str]) -> Dict[str, Optional[Dict]]:
+        """Get details for many indexers with batched id_in queries
+
+        One query per 100 indexers replaces a round-trip per indexer.
+
+        Returns:
+            Dict mapping indexer_id (lowercase) to its details dict,
+            or None where the indexer was not found
+        """
+        query = """
+        query GetIndexers($ids: [String!]!) {
+            indexers(where: { id_in: $ids }) {
+                id
+                url
+                stakedTokens
+                delegatedTokens
+                delegatorRewards
+                rewardCut
+                queryFeeCut
+            }
+        }
+        """
+        unique_ids = list({id.lower() for id in indexer_ids if id})
+        results: Dict[str, Optional[Dict]] = {id: None for id in unique_ids}
+
+        # Query in batches of 100, like the other id_in lookups
+        batch_size = 100
+        for i in range(0, len(unique_ids), batch_size):
+            batch = unique_ids[i:i + batch_size]
+            result = self.query(query, {'ids': batch})
+            for indexer in result.get('indexers', []):
+                indexer_id = indexer.get('id', '').lower()
+                if indexer_id:
+                    results[indexer_id] = indexer
+
+        return results
+
 
 class AnalyticsClient:
     """Client to query The Graph Analytics subgraph"""
@@ -681,20 +719,6 @@ def get_delegator_shares_onchain(delegator_id: str, indexer_id: str, rpc_url: Op
         return None
 
 
-def get_indexer_reward_cut(indexer_id: str, network_url: str) -> Optional[float]:
-    """Get indexer reward cut percentage"""
-    try:
-        client = TheGraphClient(network_url)
-        indexer = client.get_indexer_details(indexer_id)
-        if indexer:
-            reward_cut = indexer.get('rewardCut')
-            if reward_cut is not None:
-                return int(reward_cut) / 1e6  # Convert from PPM to decimal
-    except:
-        pass
-    return None
-
-
 def main():
     parser = argparse.ArgumentParser(
         description='Display delegator information from The Graph Network',
@@ -1021,12 +1045,10 @@ Examples:
         print_section("Active Delegations")
         print(f"  {Colors.DIM}No active delegations.{Colors.RESET}")
     else:
-        # Get indexer details for all indexers
-        indexer_details = {}
-        for d in active_delegations_list:
-            indexer_id = d['indexer']['id']
-            if indexer_id not in indexer_details:
-                indexer_details[indexer_id] = client.get_indexer_details(indexer_id)
+        # Get indexer details for all indexers in one batched query
+        indexer_details = client.get_indexers_details(
+            [d['indexer']['id'] for d in active_delegations_list]
+        )
         
         # Sort by staked amount
         active_delegations_list.sort(key=lambda x: int(x.get('stakedTokens', '0')), reverse=True)
@@ -1407,7 +1429,11 @@ Examples:
         
         total_accrued = 0.0
         total_delegator_share = 0.0
-        
+
+        # One batched query for every indexer's reward cut instead of a
+        # round-trip per indexer inside the loop
+        reward_cuts = get_indexer_reward_cuts(list(indexer_allocations.keys()), network_url)
+
         for indexer_id, allocs in indexer_allocations.items():
             # Use batch-resolved ENS names if available, otherwise resolve individually
             indexer_ens = None
@@ -1432,7 +1458,7 @@ Examples:
             
             if indexer_accrued > 0:
                 total_accrued += indexer_accrued
-                reward_cut = get_indexer_reward_cut(indexer_id, network_url)
+                reward_cut = reward_cuts.get(indexer_id.lower())
                 if reward_cut is not None:
                     delegator_share = indexer_accrued * (1 - reward_cut)
                     total_delegator_share += delegator_share
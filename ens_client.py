@@ -5,11 +5,85 @@ ENS (Ethereum Name Service) client for grtinfo CLI tools
 This module provides ENS name resolution with caching.
 """
 
+import atexit
 import json
+import os
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
-import requests
+
+# orjson serializes/parses JSON in C, ~5x faster than stdlib on large caches
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# GraphQL queries, built once at import time instead of per call
+
+_RESOLVE_ADDRESS_QUERY = """
+query ResolveAddress($address: String!) {
+    domains(
+        where: { resolvedAddress: $address }
+        first: 1
+        orderBy: createdAt
+        orderDirection: desc
+    ) {
+        name
+    }
+}
+"""
+
+_RESOLVE_ADDRESSES_QUERY = """
+query ResolveAddresses($addresses: [String!]!) {
+    domains(
+        where: { resolvedAddress_in: $addresses }
+        first: 1000
+    ) {
+        name
+        resolvedAddress { id }
+    }
+}
+"""
+
+_SEARCH_ENS_QUERY = """
+query SearchENS($search: String!) {
+    domains(
+        where: { name_contains: $search }
+        first: 20
+        orderBy: createdAt
+        orderDirection: desc
+    ) {
+        name
+        resolvedAddress { id }
+    }
+}
+"""
+
+_RESOLVE_NAME_QUERY = """
+query ResolveName($name: String!) {
+    domains(
+        where: { name: $name }
+        first: 1
+    ) {
+        resolvedAddress { id }
+    }
+}
+"""
+
+_RESOLVE_NAME_PARTIAL_QUERY = """
+query ResolveNamePartial($search: String!) {
+    domains(
+        where: { name_contains: $search }
+        first: 20
+        orderBy: createdAt
+        orderDirection: desc
+    ) {
+        name
+        resolvedAddress { id }
+    }
+}
+"""
 
 
 class ENSClient:
@@ -30,50 +104,86 @@ class ENSClient:
             cache_ttl: Cache time-to-live in seconds (default 24 hours)
         """
         self.ens_subgraph_url = ens_subgraph_url.rstrip('/')
-        self._session = requests.Session()
-        self._cache: Dict[str, dict] = {}
+        self._session = None
+        # Flat [name, timestamp] entries: cheaper than a dict per address
+        # and serialize to disk as-is
+        self._cache: Dict[str, list] = {}
         self._cache_file = Path.home() / '.grtinfo' / 'ens_cache.json'
         self._cache_ttl = cache_ttl
+        self._dirty = False
         self._load_cache()
+        # Flush once at interpreter exit instead of after every lookup:
+        # a run that resolves N new names costs one cache write, not N
+        atexit.register(self._save_cache)
     
     def _load_cache(self):
         """Load ENS cache from disk"""
         try:
             if self._cache_file.exists():
-                with open(self._cache_file, 'r') as f:
-                    cache_data = json.load(f)
-                    now = time.time()
-                    for addr, entry in cache_data.items():
-                        if isinstance(entry, dict) and 'name' in entry and 'timestamp' in entry:
-                            # Check TTL
-                            if now - entry['timestamp'] < self._cache_ttl:
-                                self._cache[addr] = entry
-                        elif isinstance(entry, str) or entry is None:
-                            # Old format - convert
-                            self._cache[addr] = {'name': entry, 'timestamp': now - self._cache_ttl + 3600}
+                raw = self._cache_file.read_bytes()
+                cache_data = orjson.loads(raw) if orjson else json.loads(raw)
+                now = time.time()
+                for addr, entry in cache_data.items():
+                    if isinstance(entry, list) and len(entry) == 2:
+                        # Check TTL
+                        if now - entry[1] < self._cache_ttl:
+                            self._cache[addr] = entry
+                    elif isinstance(entry, dict) and 'name' in entry and 'timestamp' in entry:
+                        # Old dict format - convert
+                        if now - entry['timestamp'] < self._cache_ttl:
+                            self._cache[addr] = [entry['name'], entry['timestamp']]
+                    elif isinstance(entry, str) or entry is None:
+                        # Oldest format - convert
+                        self._cache[addr] = [entry, now - self._cache_ttl + 3600]
         except:
             pass
     
     def _save_cache(self):
-        """Save ENS cache to disk"""
+        """Save ENS cache to disk (no-op if nothing changed since last save)"""
+        if not self._dirty:
+            return
         try:
             self._cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._cache_file, 'w') as f:
-                json.dump(self._cache, f, indent=2)
+            if orjson:
+                body = orjson.dumps(self._cache)
+            else:
+                # Compact separators, no pretty-printing: the cache is not
+                # meant to be read by humans and this halves the bytes written
+                body = json.dumps(self._cache, separators=(',', ':')).encode()
+            # Write to a sibling temp file and rename so a crash mid-write
+            # never leaves a truncated cache behind
+            tmp_file = self._cache_file.with_suffix('.json.tmp')
+            tmp_file.write_bytes(body)
+            os.replace(tmp_file, self._cache_file)
+            self._dirty = False
         except:
             pass
     
+    def _get_session(self):
+        """Get the HTTP session, creating it on first use
+
+        The requests import is deferred so that cache-only code paths
+        never pay the requests/urllib3 import cost.
+        """
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            # Set once on the session instead of per request
+            self._session.headers['Content-Type'] = 'application/json'
+        return self._session
+
     def query(self, query: str, variables: Optional[Dict] = None) -> Dict:
         """Execute a GraphQL query against the ENS subgraph"""
+        payload = {'query': query, 'variables': variables or {}}
+        body = orjson.dumps(payload) if orjson else json.dumps(payload)
         try:
-            response = self._session.post(
+            response = self._get_session().post(
                 self.ens_subgraph_url,
-                json={'query': query, 'variables': variables or {}},
-                headers={'Content-Type': 'application/json'},
+                data=body,
                 timeout=10
             )
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content) if orjson else response.json()
             if 'errors' in data:
                 return {}
             return data.get('data', {})
@@ -95,42 +205,30 @@ class ENSClient:
         address_lower = address.lower()
         
         # Check cache
-        if address_lower in self._cache:
-            entry = self._cache[address_lower]
-            if isinstance(entry, dict):
-                return entry.get('name')
-            return entry
+        entry = self._cache.get(address_lower)
+        if entry is not None:
+            return entry[0]
         
         # Query subgraph
-        query = """
-        query ResolveAddress($address: String!) {
-            domains(
-                where: { resolvedAddress: $address }
-                first: 1
-                orderBy: createdAt
-                orderDirection: desc
-            ) {
-                name
-            }
-        }
-        """
-        
+        name = None
         try:
-            result = self.query(query, {'address': address_lower})
-            domains = result.get('domains', [])
+            result = self.query(_RESOLVE_ADDRESS_QUERY, {'address': address_lower})
+            # query() returns {} on transport errors and rate limits; only a
+            # response that actually contains 'domains' proves the address has
+            # no name, so don't poison the cache with failures
+            if 'domains' not in result:
+                return None
+            domains = result['domains']
             if domains:
                 name = domains[0].get('name')
-                if name:
-                    self._cache[address_lower] = {'name': name, 'timestamp': time.time()}
-                    self._save_cache()
-                    return name
         except:
-            pass
-        
-        # Cache negative result
-        self._cache[address_lower] = {'name': None, 'timestamp': time.time()}
-        self._save_cache()
-        return None
+            return None
+
+        # Cache the result (genuine negative results included); the dirty
+        # entry is flushed to disk by the atexit hook
+        self._cache[address_lower] = [name, time.time()]
+        self._dirty = True
+        return name
     
     def resolve_addresses_batch(self, addresses: List[str]) -> Dict[str, Optional[str]]:
         """Resolve multiple addresses in a single query
@@ -142,20 +240,16 @@ class ENSClient:
             Dict mapping address (lowercase) to ENS name or None
         """
         results = {}
-        addresses_lower = [addr.lower() for addr in addresses if addr and addr != 'Unknown']
-        
-        if not addresses_lower:
-            return results
-        
-        # Check cache first
+
+        # Single pass: lowercase once and split into cached / to-query
         to_query = []
-        for addr in addresses_lower:
-            if addr in self._cache:
-                entry = self._cache[addr]
-                if isinstance(entry, dict):
-                    results[addr] = entry.get('name')
-                else:
-                    results[addr] = entry
+        for addr in addresses:
+            if not addr or addr == 'Unknown':
+                continue
+            addr = addr.lower()
+            entry = self._cache.get(addr)
+            if entry is not None:
+                results[addr] = entry[0]
             else:
                 to_query.append(addr)
         
@@ -163,40 +257,38 @@ class ENSClient:
         if not to_query:
             return results
         
-        # Batch query uncached addresses
-        query = """
-        query ResolveAddresses($addresses: [String!]!) {
-            domains(
-                where: { resolvedAddress_in: $addresses }
-                first: 100
-            ) {
-                name
-                resolvedAddress { id }
-            }
-        }
-        """
-        
-        try:
-            result = self.query(query, {'addresses': to_query})
-            domains = result.get('domains', [])
-            
-            for domain in domains:
-                addr = domain.get('resolvedAddress', {}).get('id', '').lower()
-                name = domain.get('name')
-                if addr and name:
-                    results[addr] = name
-                    self._cache[addr] = {'name': name, 'timestamp': time.time()}
-            
-            # Cache negative results
-            for addr in to_query:
-                if addr not in results:
-                    results[addr] = None
-                    self._cache[addr] = {'name': None, 'timestamp': time.time()}
-            
-            self._save_cache()
-        except:
-            pass
-        
+        # Batch query uncached addresses in pages of 100. The query asks for
+        # up to 1000 domains per page: one address can resolve several
+        # domains, so the limit must sit well above the page size or extra
+        # domains would push real matches past the cutoff and poison the
+        # negative cache
+        batch_size = 100
+        for i in range(0, len(to_query), batch_size):
+            chunk = to_query[i:i + batch_size]
+            try:
+                result = self.query(_RESOLVE_ADDRESSES_QUERY, {'addresses': chunk})
+                # An empty dict means the query failed (query() swallows
+                # errors); skip the chunk rather than negative-caching it
+                if 'domains' not in result:
+                    continue
+
+                for domain in result['domains']:
+                    addr = domain.get('resolvedAddress', {}).get('id', '').lower()
+                    name = domain.get('name')
+                    if addr and name:
+                        results[addr] = name
+                        self._cache[addr] = [name, time.time()]
+                        self._dirty = True
+
+                # Cache genuine negative results
+                for addr in chunk:
+                    if addr not in results:
+                        results[addr] = None
+                        self._cache[addr] = [None, time.time()]
+                        self._dirty = True
+            except:
+                pass
+
         return results
     
     def search_by_ens(self, partial_name: str) -> List[Dict]:
@@ -208,20 +300,7 @@ class ENSClient:
         Returns:
             List of dicts with 'name' and 'resolvedAddress' keys
         """
-        query = """
-        query SearchENS($search: String!) {
-            domains(
-                where: { name_contains: $search }
-                first: 20
-                orderBy: createdAt
-                orderDirection: desc
-            ) {
-                name
-                resolvedAddress { id }
-            }
-        }
-        """
-        result = self.query(query, {'search': partial_name.lower()})
+        result = self.query(_SEARCH_ENS_QUERY, {'search': partial_name.lower()})
         return result.get('domains', [])
     
     def resolve_name(self, name: str) -> Optional[str]:
@@ -236,17 +315,7 @@ class ENSClient:
         name_lower = name.lower()
         
         # Try exact match first
-        query = """
-        query ResolveName($name: String!) {
-            domains(
-                where: { name: $name }
-                first: 1
-            ) {
-                resolvedAddress { id }
-            }
-        }
-        """
-        result = self.query(query, {'name': name_lower})
+        result = self.query(_RESOLVE_NAME_QUERY, {'name': name_lower})
         domains = result.get('domains', [])
         if domains:
             resolved = domains[0].get('resolvedAddress', {})
@@ -256,7 +325,7 @@ class ENSClient:
         # If not found and name doesn't end with .eth, try adding .eth
         if not name_lower.endswith('.eth'):
             name_with_eth = name_lower + '.eth'
-            result = self.query(query, {'name': name_with_eth})
+            result = self.query(_RESOLVE_NAME_QUERY, {'name': name_with_eth})
             domains = result.get('domains', [])
             if domains:
                 resolved = domains[0].get('resolvedAddress', {})
@@ -265,20 +334,7 @@ class ENSClient:
         
         # If still not found, try partial match (name contains the search term)
         # This helps find names like "ellipfra-indexer.eth" when searching for "ellipfra"
-        query_partial = """
-        query ResolveNamePartial($search: String!) {
-            domains(
-                where: { name_contains: $search }
-                first: 20
-                orderBy: createdAt
-                orderDirection: desc
-            ) {
-                name
-                resolvedAddress { id }
-            }
-        }
-        """
-        result = self.query(query_partial, {'search': name_lower})
+        result = self.query(_RESOLVE_NAME_PARTIAL_QUERY, {'search': name_lower})
         domains = result.get('domains', [])
         if domains:
             # Prefer names that start with the search term (exact prefix match)
@@ -10,8 +10,86 @@ import sys
 from typing import Dict, Optional
 import requests
 
+# httpx is optional: when installed, queries share one HTTP/2 connection,
+# which multiplexes concurrent requests to the same gateway
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# orjson parses JSON in C, ~5x faster than stdlib on large responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from common import Colors
 
+# Exception groups covering whichever HTTP stack is in use
+_TIMEOUT_ERRORS = (requests.exceptions.Timeout,) + ((httpx.TimeoutException,) if httpx else ())
+_CONNECTION_ERRORS = (requests.exceptions.ConnectionError,) + ((httpx.ConnectError,) if httpx else ())
+_HTTP_ERRORS = (requests.exceptions.HTTPError,) + ((httpx.HTTPStatusError,) if httpx else ())
+
+# Sized above the widest thread-pool fan-out used by the tools
+# (max_workers up to 20 in delegatorinfo, 15 in subinfo), so no worker
+# ever blocks waiting for a pooled connection
+_POOL_MAXSIZE = 32
+
+
+def _create_session():
+    """Create an HTTP client: httpx with HTTP/2 when available, else requests"""
+    if httpx is not None:
+        try:
+            session = httpx.Client(http2=True)
+        except ImportError:
+            # The h2 extra is not installed; plain httpx still pools fine
+            session = httpx.Client()
+    else:
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        # Transparently retry transient gateway failures; GraphQL queries
+        # and eth_calls are idempotent reads, so retrying POSTs is safe
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset(['HEAD', 'GET', 'POST'])
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=_POOL_MAXSIZE,
+            pool_maxsize=_POOL_MAXSIZE,
+            max_retries=retries
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+    # All traffic through this session is JSON (GraphQL and JSON-RPC)
+    session.headers['Content-Type'] = 'application/json'
+    return session
+
+
+# Process-wide session: every GraphQL client and the rewards helpers share
+# one connection pool instead of each opening their own
+_shared_session = None
+
+
+def get_shared_session():
+    """Get the process-wide HTTP session, creating it on first use"""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = _create_session()
+    return _shared_session
+
+
+def _is_persisted_query_miss(data: Dict) -> bool:
+    """Check whether a response reports an unknown persisted-query hash"""
+    for error in data.get('errors', []):
+        if error.get('message') == 'PersistedQueryNotFound':
+            return True
+        if error.get('extensions', {}).get('code') == 'PERSISTED_QUERY_NOT_FOUND':
+            return True
+    return False
+
 
 class GraphQLClient:
     """Base GraphQL client with error handling and session management
@@ -20,70 +98,134 @@ class GraphQLClient:
     in the grtinfo tools (network subgraph, ENS, analytics, etc.)
     """
     
-    def __init__(self, url: str, timeout: int = 30, silent_errors: bool = False):
+    def __init__(self, url: str, timeout: int = 30, silent_errors: bool = False,
+                 use_persisted_queries: bool = False, warmup: bool = False):
         """Initialize GraphQL client
-        
+
         Args:
             url: GraphQL endpoint URL
             timeout: Request timeout in seconds (default 30)
             silent_errors: If True, don't print errors to stderr
+            use_persisted_queries: If True, use Automatic Persisted Queries:
+                repeated queries are sent as a sha256 hash, with the full
+                text only transmitted when the gateway does not know it yet
+            warmup: If True, pre-establish the connection (DNS + TCP + TLS)
+                at construction so the first query skips handshake latency
         """
         self.url = url.rstrip('/')
-        self._session = requests.Session()
+        self._session = get_shared_session()
         self._timeout = timeout
         self._silent_errors = silent_errors
-    
+        self._use_persisted_queries = use_persisted_queries
+        self._persisted_hashes: Dict[str, str] = {}
+        if warmup:
+            self.warmup()
+
+    def warmup(self):
+        """Pre-establish the HTTP connection to the endpoint
+
+        Resolves DNS and completes the TCP/TLS handshake with a cheap HEAD
+        request; the pooled connection is then reused by the first real
+        query. Failures are ignored — the query path will surface them.
+        """
+        try:
+            self._session.head(self.url, timeout=5)
+        except Exception:
+            pass
+
     def query(self, query: str, variables: Optional[Dict] = None) -> Dict:
         """Execute a GraphQL query
-        
+
         Args:
             query: GraphQL query string
             variables: Optional dict of query variables
-        
+
         Returns:
             Dict containing the 'data' portion of the response,
             or empty dict on error
         """
+        variables = variables or {}
+        if self._use_persisted_queries:
+            data = self._post_persisted(query, variables)
+        else:
+            data = self._post({'query': query, 'variables': variables})
+
+        if data is None:
+            return {}
+
+        if 'errors' in data:
+            if not self._silent_errors:
+                for error in data['errors']:
+                    msg = error.get('message', 'Unknown GraphQL error')
+                    print(f"{Colors.RED}GraphQL error: {msg}{Colors.RESET}", file=sys.stderr)
+            return {}
+
+        return data.get('data', {})
+
+    def _post_persisted(self, query: str, variables: Dict) -> Optional[Dict]:
+        """Execute a query via the Automatic Persisted Queries protocol
+
+        Sends only the query's sha256 hash; if the gateway answers with
+        PersistedQueryNotFound, retries once with the full text so the hash
+        is registered for subsequent calls.
+        """
+        import hashlib
+
+        query_hash = self._persisted_hashes.get(query)
+        if query_hash is None:
+            query_hash = hashlib.sha256(query.encode()).hexdigest()
+            self._persisted_hashes[query] = query_hash
+
+        extensions = {'persistedQuery': {'version': 1, 'sha256Hash': query_hash}}
+        data = self._post({'variables': variables, 'extensions': extensions})
+
+        if data is not None and _is_persisted_query_miss(data):
+            data = self._post({
+                'query': query,
+                'variables': variables,
+                'extensions': extensions,
+            })
+        return data
+
+    def _post(self, payload: Dict) -> Optional[Dict]:
+        """POST a GraphQL payload, returning the parsed response body
+
+        Transport errors are reported the usual way and yield None.
+        """
         try:
             response = self._session.post(
                 self.url,
-                json={'query': query, 'variables': variables or {}},
-                headers={'Content-Type': 'application/json'},
+                json=payload,
                 timeout=self._timeout
             )
             response.raise_for_status()
-            data = response.json()
-            
-            if 'errors' in data:
-                if not self._silent_errors:
-                    errors = data['errors']
-                    for error in errors:
-                        msg = error.get('message', 'Unknown GraphQL error')
-                        print(f"{Colors.RED}GraphQL error: {msg}{Colors.RESET}", file=sys.stderr)
-                return {}
-            
-            return data.get('data', {})
-            
-        except requests.exceptions.Timeout:
+            if orjson:
+                return orjson.loads(response.content)
+            return response.json()
+        except _TIMEOUT_ERRORS:
             if not self._silent_errors:
                 print(f"{Colors.RED}Query timeout after {self._timeout}s{Colors.RESET}", file=sys.stderr)
-            return {}
-        except requests.exceptions.ConnectionError:
+            return None
+        except _CONNECTION_ERRORS:
             if not self._silent_errors:
                 print(f"{Colors.RED}Connection error to {self.url}{Colors.RESET}", file=sys.stderr)
-            return {}
-        except requests.exceptions.HTTPError as e:
+            return None
+        except _HTTP_ERRORS as e:
             if not self._silent_errors:
                 print(f"{Colors.RED}HTTP error: {e}{Colors.RESET}", file=sys.stderr)
-            return {}
+            return None
         except Exception as e:
             if not self._silent_errors:
                 print(f"{Colors.RED}Query error: {e}{Colors.RESET}", file=sys.stderr)
-            return {}
+            return None
     
     def close(self):
-        """Close the session"""
-        self._session.close()
+        """Release this client's session reference
+
+        The underlying session is shared process-wide, so it is left open
+        for other clients; it is torn down at interpreter exit.
+        """
+        self._session = None
     
     def __enter__(self):
         return self
@@ -95,88 +237,148 @@ class GraphQLClient:
 
 class NetworkSubgraphClient(GraphQLClient):
     """Client for The Graph Network subgraph
-    
+
     Provides common queries used across multiple tools.
     """
-    
-    def get_indexer_details(self, indexer_id: str) -> Optional[Dict]:
-        """Get basic indexer information"""
-        query = """
-        query GetIndexer($id: String!) {
-            indexer(id: $id) {
-                id
-                url
-                stakedTokens
-                delegatedTokens
-                allocatedTokens
-                indexingRewardCut
-                queryFeeCut
-                delegatorShares
-                allocationCount
+
+    # Query strings are class constants, built once at class creation
+    # instead of per call
+
+    INDEXERS_DETAILS_QUERY = """
+    query GetIndexers($ids: [String!]!) {
+        indexers(where: { id_in: $ids }) {
+            id
+            url
+            stakedTokens
+            delegatedTokens
+            allocatedTokens
+            indexingRewardCut
+            queryFeeCut
+            delegatorShares
+            allocationCount
+        }
+    }
+    """
+
+    DEPLOYMENT_INFO_QUERY = """
+    query GetDeployment($ipfsHash: String!) {
+        subgraphDeployments(where: { ipfsHash: $ipfsHash }, first: 1) {
+            id
+            ipfsHash
+            signalledTokens
+            stakedTokens
+            createdAt
+            manifest {
+                network
+            }
+            versions(first: 1, orderBy: createdAt, orderDirection: desc) {
+                subgraph {
+                    id
+                }
             }
         }
+    }
+    """
+
+    def __init__(self, url: str, timeout: int = 30, silent_errors: bool = False):
+        super().__init__(url, timeout=timeout, silent_errors=silent_errors)
+        # Memoized lookups: tools tend to ask for the same indexer or
+        # deployment several times while rendering one report
+        self._indexer_details_cache: Dict[str, Optional[Dict]] = {}
+        self._deployment_info_cache: Dict[str, Optional[Dict]] = {}
+        self._indexer_url_cache: Dict[str, str] = {}
+
+    def get_indexer_details(self, indexer_id: str) -> Optional[Dict]:
+        """Get basic indexer information (memoized per client)
+
+        Routes through the bulk id_in query so single and batched lookups
+        share one code path and warm the same caches.
         """
-        result = self.query(query, {'id': indexer_id.lower()})
-        return result.get('indexer')
+        indexer_id = indexer_id.lower()
+        if indexer_id in self._indexer_details_cache:
+            return self._indexer_details_cache[indexer_id]
+        indexer = self.get_indexers_details([indexer_id]).get(indexer_id)
+        # get_indexers_details only records hits; remember misses here so
+        # repeated lookups for an unknown indexer don't re-query
+        self._indexer_details_cache[indexer_id] = indexer
+        return indexer
     
-    def get_indexers_urls(self, indexer_ids: list) -> Dict[str, str]:
-        """Get URLs for multiple indexers
-        
+    def get_indexers_details(self, indexer_ids: list) -> Dict[str, Dict]:
+        """Get URL, reward cut and stake details for many indexers at once
+
+        One id_in query replaces separate per-indexer details, URL and
+        reward-cut lookups. Results also warm the per-client caches, so
+        subsequent get_indexer_details / get_indexers_urls calls for the
+        same ids are free.
+
         Args:
             indexer_ids: List of indexer addresses
-        
+
         Returns:
-            Dict mapping indexer_id (lowercase) to URL
+            Dict mapping indexer_id (lowercase) to its details dict
         """
         if not indexer_ids:
             return {}
-        
-        unique_ids = list(set(id.lower() for id in indexer_ids if id))
-        results = {}
-        
+
+        unique_ids = list({id.lower() for id in indexer_ids if id})
+        results: Dict[str, Dict] = {}
+
         # Query in batches of 100
         batch_size = 100
         for i in range(0, len(unique_ids), batch_size):
-            batch = unique_ids[i:i+batch_size]
-            query = """
-            query GetIndexersUrls($ids: [String!]!) {
-                indexers(where: { id_in: $ids }) {
-                    id
-                    url
-                }
-            }
-            """
-            result = self.query(query, {'ids': batch})
+            batch = unique_ids[i:i + batch_size]
+            result = self.query(self.INDEXERS_DETAILS_QUERY, {'ids': batch})
             for indexer in result.get('indexers', []):
                 indexer_id = indexer.get('id', '').lower()
+                if not indexer_id:
+                    continue
+                results[indexer_id] = indexer
+                self._indexer_details_cache[indexer_id] = indexer
                 url = indexer.get('url')
                 if url:
-                    results[indexer_id] = url
+                    self._indexer_url_cache[indexer_id] = url
+
+        return results
+
+    def get_indexers_urls(self, indexer_ids: list) -> Dict[str, str]:
+        """Get URLs for multiple indexers
+        
+        Args:
+            indexer_ids: List of indexer addresses
         
+        Returns:
+            Dict mapping indexer_id (lowercase) to URL
+        """
+        if not indexer_ids:
+            return {}
+
+        unique_ids = set(id.lower() for id in indexer_ids if id)
+        results = {
+            id: self._indexer_url_cache[id]
+            for id in unique_ids if id in self._indexer_url_cache
+        }
+
+        # Early exit when everything was already resolved this process
+        to_query = [id for id in unique_ids if id not in results]
+        if not to_query:
+            return results
+
+        # One bulk details query resolves the URLs and warms the details
+        # cache as a side effect, so later per-indexer lookups are free
+        for indexer_id, indexer in self.get_indexers_details(to_query).items():
+            url = indexer.get('url')
+            if url:
+                results[indexer_id] = url
+
         return results
     
     def get_deployment_info(self, ipfs_hash: str) -> Optional[Dict]:
-        """Get subgraph deployment information by IPFS hash"""
-        query = """
-        query GetDeployment($ipfsHash: String!) {
-            subgraphDeployments(where: { ipfsHash: $ipfsHash }, first: 1) {
-                id
-                ipfsHash
-                signalledTokens
-                stakedTokens
-                createdAt
-                manifest {
-                    network
-                }
-                versions(first: 1, orderBy: createdAt, orderDirection: desc) {
-                    subgraph {
-                        id
-                    }
-                }
-            }
-        }
-        """
-        result = self.query(query, {'ipfsHash': ipfs_hash})
-        deployments = result.get('subgraphDeployments', [])
-        return deployments[0] if deployments else None
+        """Get subgraph deployment information by IPFS hash (memoized per client)"""
+        if ipfs_hash in self._deployment_info_cache:
+            return self._deployment_info_cache[ipfs_hash]
+        result = self.query(self.DEPLOYMENT_INFO_QUERY, {'ipfsHash': ipfs_hash})
+        deployments = result.get('subgraphDeployments')
+        deployment = deployments[0] if deployments else None
+        self._deployment_info_cache[ipfs_hash] = deployment
+        return deployment
 
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+HorizonStakingClient - Workaround for subgraph tokenCapacity bug
+
+Issue: https://github.com/graphprotocol/graph-network-subgraph/issues/323
+
+The subgraph's tokenCapacity can be stale because delegationExchangeRate
+is not updated when rewards accumulate in the delegation pool. This client
+fetches the accurate value directly from the HorizonStaking contract.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from contracts import (
+    STAKING, SUBGRAPH_SERVICE,
+    GET_TOKENS_AVAILABLE_SELECTOR, GET_DELEGATION_RATIO_SELECTOR
+)
+
+
+class HorizonStakingClient:
+    """Client for fetching staking data directly from the HorizonStaking contract.
+
+    This is a workaround for the subgraph's tokenCapacity being out of sync
+    with the contract's getTokensAvailable value.
+    """
+
+    def __init__(self, rpc_url: str):
+        self.rpc_url = rpc_url
+        self._delegation_ratio: Optional[int] = None
+        self._session = None
+
+    def _get_session(self):
+        """Get the HTTP session, creating it on first use
+
+        A Session keeps the TCP/TLS connection to the RPC endpoint alive
+        between calls. The requests import is deferred so callers that only
+        need addresses/selectors from this module don't pay the import cost.
+        """
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    def _eth_call(self, to: str, data: str) -> Optional[str]:
+        """Make an eth_call to the contract."""
+        payload = {
+            "jsonrpc": "2.0",
+            "method": "eth_call",
+            "params": [{"to": to, "data": data}, "latest"],
+            "id": 1,
+        }
+        import requests
+
+        try:
+            response = self._get_session().post(self.rpc_url, json=payload, timeout=10)
+            response.raise_for_status()
+            result = response.json()
+            if "error" in result:
+                return None
+            return result.get("result")
+        except requests.RequestException:
+            return None
+
+    def _eth_call_batch(self, calls: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """Make several eth_calls in a single JSON-RPC batch request.
+
+        Args:
+            calls: List of (to, data) tuples
+
+        Returns:
+            List of hex results in the same order; None for failed calls.
+        """
+        import requests
+
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "method": "eth_call",
+                "params": [{"to": to, "data": data}, "latest"],
+                "id": i,
+            }
+            for i, (to, data) in enumerate(calls)
+        ]
+        try:
+            response = self._get_session().post(self.rpc_url, json=payload, timeout=10)
+            response.raise_for_status()
+            results = response.json()
+        except requests.RequestException:
+            return [None] * len(calls)
+
+        if not isinstance(results, list):
+            return [None] * len(calls)
+
+        by_id = {}
+        for item in results:
+            if isinstance(item, dict) and "error" not in item:
+                by_id[item.get("id")] = item.get("result")
+        return [by_id.get(i) for i in range(len(calls))]
+
+    def _encode_address(self, address: str) -> str:
+        """Encode an address as a 32-byte hex string."""
+        addr = address.lower()
+        if addr.startswith("0x"):
+            addr = addr[2:]
+        return addr.zfill(64)
+
+    def _encode_uint32(self, value: int) -> str:
+        """Encode a uint32 as a 32-byte hex string."""
+        return hex(value)[2:].zfill(64)
+
+    def _decode_uint256(self, hex_data: str) -> int:
+        """Decode a uint256 from hex string."""
+        if not hex_data or hex_data == "0x":
+            return 0
+        # bytes.fromhex + int.from_bytes is faster than int(s, 16) parsing
+        return int.from_bytes(bytes.fromhex(hex_data[2:] if hex_data.startswith("0x") else hex_data), "big")
+
+    def get_delegation_ratio(self) -> int:
+        """Get the delegation ratio from the SubgraphService contract."""
+        if self._delegation_ratio is not None:
+            return self._delegation_ratio
+
+        result = self._eth_call(SUBGRAPH_SERVICE, GET_DELEGATION_RATIO_SELECTOR)
+        if result:
+            self._delegation_ratio = self._decode_uint256(result)
+            return self._delegation_ratio
+        return 16  # Default fallback
+
+    def get_tokens_available(self, indexer_address: str) -> Optional[int]:
+        """Get the tokens available for an indexer from the contract.
+
+        Returns the value in wei (not GRT), or None if the call fails.
+        """
+        delegation_ratio = self.get_delegation_ratio()
+
+        data = (
+            GET_TOKENS_AVAILABLE_SELECTOR
+            + self._encode_address(indexer_address)
+            + self._encode_address(SUBGRAPH_SERVICE)
+            + self._encode_uint32(delegation_ratio)
+        )
+
+        result = self._eth_call(STAKING, data)
+        if result:
+            return self._decode_uint256(result)
+        return None
+
+    def get_tokens_available_batch(self, indexer_addresses: List[str]) -> Dict[str, Optional[int]]:
+        """Get tokens available for several indexers in one RPC round-trip.
+
+        Args:
+            indexer_addresses: List of indexer addresses
+
+        Returns:
+            Dict mapping each address to its tokens available in wei,
+            or None where the call failed.
+        """
+        if not indexer_addresses:
+            return {}
+
+        delegation_ratio = self.get_delegation_ratio()
+        service = self._encode_address(SUBGRAPH_SERVICE)
+        ratio = self._encode_uint32(delegation_ratio)
+
+        calls = [
+            (STAKING, GET_TOKENS_AVAILABLE_SELECTOR + self._encode_address(addr) + service + ratio)
+            for addr in indexer_addresses
+        ]
+        raw = self._eth_call_batch(calls)
+        return {
+            addr: (self._decode_uint256(result) if result else None)
+            for addr, result in zip(indexer_addresses, raw)
+        }
+
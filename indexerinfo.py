@@ -38,7 +38,7 @@ from common import (
     format_timestamp, format_duration, print_section
 )
 from config import get_network_subgraph_url, get_ens_subgraph_url, get_rpc_url
-from contracts import HorizonStakingClient
+from horizon_client import HorizonStakingClient
 from ens_client import ENSClient
 from sync_status import IndexerStatusClient, format_sync_status as _format_sync_status
 from logger import setup_logging, get_logger
@@ -7,11 +7,10 @@ both on-chain contracts and The Graph Network subgraph.
 """
 
 from typing import Dict, List, Optional
-import requests
 
 from contracts import (
     REWARDS_MANAGER, STAKING, SUBGRAPH_SERVICE,
-    PPM_BASE, GRT_DECIMALS
+    PPM_BASE, GRT_DECIMALS, GET_REWARDS_SELECTOR
 )
 
 # Check if web3 is available
@@ -21,6 +20,29 @@ try:
 except ImportError:
     HAS_WEB3 = False
 
+# Checksummed once at import: eth.call validates mixed-case addresses
+_REWARDS_MANAGER_CHECKSUM = Web3.to_checksum_address(REWARDS_MANAGER) if HAS_WEB3 else REWARDS_MANAGER
+
+
+def _get_session():
+    """Get the process-wide HTTP session shared with the GraphQL clients"""
+    from graphql_client import get_shared_session
+    return get_shared_session()
+
+
+# Web3 instances keyed by RPC URL; the HTTPProvider keeps a persistent
+# session, so sharing the instance reuses its connection across calls
+_w3_instances: Dict[str, "Web3"] = {}
+
+
+def _get_w3(rpc_url: str) -> "Web3":
+    """Get the shared Web3 instance for an RPC endpoint, creating it on first use"""
+    w3 = _w3_instances.get(rpc_url)
+    if w3 is None:
+        w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={'timeout': 30}))
+        _w3_instances[rpc_url] = w3
+    return w3
+
 
 def get_accrued_rewards(
     allocation_id: str,
@@ -42,23 +64,27 @@ def get_accrued_rewards(
         return None
     
     try:
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
-        
-        # Function selector for getRewards(address,address)
-        selector = Web3.keccak(text="getRewards(address,address)")[:4].hex()
-        
-        # Try both rewards issuers (legacy Staking and new SubgraphService)
-        for issuer in [STAKING, SUBGRAPH_SERVICE]:
+        w3 = _get_w3(rpc_url)
+
+        # Encode the allocation once; only the issuer part differs per call
+        alloc_encoded = allocation_id[2:].lower().zfill(64)
+
+        # Try both rewards issuers; SubgraphService first since post-Horizon
+        # allocations accrue there, so the common case needs only one call
+        for issuer in [SUBGRAPH_SERVICE, STAKING]:
             try:
-                calldata = selector + issuer[2:].lower().zfill(64) + allocation_id[2:].lower().zfill(64)
+                calldata = GET_REWARDS_SELECTOR[2:] + issuer[2:].lower().zfill(64) + alloc_encoded
                 result = w3.eth.call({
-                    "to": Web3.to_checksum_address(REWARDS_MANAGER),
+                    "to": _REWARDS_MANAGER_CHECKSUM,
                     "data": f"0x{calldata}"
                 })
-                rewards_wei = int(result.hex(), 16)
+                # eth.call returns bytes; decode directly instead of via hex
+                rewards_wei = int.from_bytes(result, "big")
                 if rewards_wei > 0:
                     return rewards_wei / (10 ** GRT_DECIMALS)
-            except:
+            except Exception:
+                # Per-issuer failures fall through to the next issuer;
+                # a bare except here would also swallow KeyboardInterrupt
                 continue
         
         return 0.0
@@ -69,45 +95,71 @@ def get_accrued_rewards(
 
 def get_indexer_reward_cut(indexer_id: str, network_url: str) -> Optional[float]:
     """Get the indexer's reward cut from the network subgraph
-    
+
     The reward cut is the percentage of indexing rewards kept by the indexer
     (vs distributed to delegators).
-    
+
     Args:
         indexer_id: Indexer address (0x...)
         network_url: URL of The Graph Network subgraph
-    
+
     Returns:
         Reward cut as decimal (e.g., 0.265 = 26.5%), or None if failed
     """
-    try:
-        url = network_url.rstrip('/')
-        
-        query = """
-        query GetIndexer($id: String!) {
-            indexer(id: $id) {
-                indexingRewardCut
-            }
+    return get_indexer_reward_cuts([indexer_id], network_url).get(indexer_id.lower())
+
+
+def get_indexer_reward_cuts(indexer_ids: List[str], network_url: str) -> Dict[str, Optional[float]]:
+    """Get reward cuts for several indexers in a single subgraph query
+
+    Args:
+        indexer_ids: List of indexer addresses (0x...)
+        network_url: URL of The Graph Network subgraph
+
+    Returns:
+        Dict mapping indexer_id (lowercase) to reward cut as decimal,
+        or None where the lookup failed
+    """
+    unique_ids = list({id.lower() for id in indexer_ids if id})
+    results: Dict[str, Optional[float]] = {id: None for id in unique_ids}
+    if not unique_ids:
+        return results
+
+    url = network_url.rstrip('/')
+    session = _get_session()
+
+    query = """
+    query GetIndexers($ids: [String!]!) {
+        indexers(where: { id_in: $ids }) {
+            id
+            indexingRewardCut
         }
-        """
-        response = requests.post(
-            url,
-            json={'query': query, 'variables': {'id': indexer_id.lower()}},
-            timeout=10
-        )
-        response.raise_for_status()
-        data = response.json().get('data', {})
-        indexer = data.get('indexer')
-        
-        if indexer:
-            # indexingRewardCut is in PPM (parts per million)
-            cut_ppm = int(indexer.get('indexingRewardCut', 0))
-            return cut_ppm / PPM_BASE
-        
-        return None
-        
-    except Exception:
-        return None
+    }
+    """
+
+    # Query in batches of 100, like the other id_in lookups
+    batch_size = 100
+    for i in range(0, len(unique_ids), batch_size):
+        batch = unique_ids[i:i + batch_size]
+        try:
+            response = session.post(
+                url,
+                json={'query': query, 'variables': {'ids': batch}},
+                timeout=10
+            )
+            response.raise_for_status()
+            data = response.json().get('data', {})
+        except Exception:
+            continue
+
+        for indexer in data.get('indexers', []):
+            indexer_id = indexer.get('id', '').lower()
+            if indexer_id:
+                # indexingRewardCut is in PPM (parts per million)
+                cut_ppm = int(indexer.get('indexingRewardCut', 0))
+                results[indexer_id] = cut_ppm / PPM_BASE
+
+    return results
 
 
 def calculate_reward_split(
@@ -159,32 +211,66 @@ def get_legacy_rewards_from_events(
         return None
     
     try:
+        from concurrent.futures import ThreadPoolExecutor
+
         from contracts import HORIZON_REWARD_ASSIGNED_TOPIC, pad_address
-        
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
-        
+
+        w3 = _get_w3(rpc_url)
+
         # Filter for HorizonRewardAssigned events for this allocation
         alloc_topic = pad_address(allocation_id)
-        
-        logs = w3.eth.get_logs({
-            "address": REWARDS_MANAGER,
-            "topics": [
-                HORIZON_REWARD_ASSIGNED_TOPIC,
-                None,  # indexer (any)
-                alloc_topic  # allocation ID
-            ],
-            "fromBlock": from_block,
-            "toBlock": to_block
-        })
-        
-        total_rewards = 0
-        for log in logs:
-            # Data contains the amount (uint256)
-            amount = int(log.data.hex(), 16)
-            total_rewards += amount
-        
-        return total_rewards
-        
+
+        # Split the range so no single get_logs hits provider block limits
+        # (public endpoints commonly cap around 10k blocks per request),
+        # and the chunks can be fetched in parallel
+        chunk_size = 10_000
+        ranges = []
+        start = from_block
+        while start <= to_block:
+            end = min(start + chunk_size - 1, to_block)
+            ranges.append((start, end))
+            start = end + 1
+
+        def fetch_range(start_block: int, end_block: int, depth: int = 0) -> int:
+            """Sum event amounts for one block range, splitting on failure
+
+            Providers reject windows that are too wide or match too many
+            logs; halving the window and retrying handles those limits.
+            After a few splits the error is treated as genuine and
+            re-raised, so a dead endpoint still fails the whole lookup
+            instead of silently under-reporting.
+            """
+            try:
+                logs = w3.eth.get_logs({
+                    "address": REWARDS_MANAGER,
+                    "topics": [
+                        HORIZON_REWARD_ASSIGNED_TOPIC,
+                        None,  # indexer (any)
+                        alloc_topic  # allocation ID
+                    ],
+                    "fromBlock": start_block,
+                    "toBlock": end_block
+                })
+            except Exception:
+                if depth >= 3 or start_block >= end_block:
+                    raise
+                mid = (start_block + end_block) // 2
+                return (fetch_range(start_block, mid, depth + 1)
+                        + fetch_range(mid + 1, end_block, depth + 1))
+            # Data contains the amount (uint256); sum per chunk so the
+            # log objects can be discarded immediately
+            return sum(int.from_bytes(log.data, "big") for log in logs)
+
+        def fetch_chunk(block_range: tuple) -> int:
+            return fetch_range(*block_range)
+
+        if len(ranges) == 1:
+            return fetch_chunk(ranges[0])
+
+        # Limit workers as elsewhere to avoid file descriptor exhaustion
+        with ThreadPoolExecutor(max_workers=min(5, len(ranges))) as executor:
+            return sum(executor.map(fetch_chunk, ranges))
+
     except Exception:
         return None
 
@@ -194,71 +280,76 @@ def get_rewards_batch(
     rpc_url: str = "https://arb1.arbitrum.io/rpc",
     max_workers: int = 5
 ) -> Dict[str, Optional[float]]:
-    """Get accrued rewards for multiple allocations in parallel
-    
-    Uses a shared Web3 instance to avoid opening too many connections.
-    
+    """Get accrued rewards for multiple allocations via JSON-RPC batching
+
+    Sends the eth_calls as JSON-RPC batch requests (one HTTP round-trip
+    per chunk of allocations) instead of one request per allocation, so
+    no thread pool or per-call connection is needed.
+
     Args:
         allocation_ids: List of allocation IDs
         rpc_url: Arbitrum RPC endpoint URL
-        max_workers: Maximum number of parallel requests (default 5 to avoid file descriptor limits)
-    
+        max_workers: Unused, kept for backward compatibility
+
     Returns:
         Dict mapping allocation_id to rewards (or None if failed)
     """
-    if not HAS_WEB3:
-        return {alloc_id: None for alloc_id in allocation_ids}
-    
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    import threading
-    
-    results = {}
-    
-    # Create a single shared Web3 instance with a session that handles connection pooling
-    w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={'timeout': 30}))
-    
-    # Pre-compute the selector once
-    selector = Web3.keccak(text="getRewards(address,address)")[:4].hex()
-    
-    # Thread-local storage not needed since Web3 HTTPProvider handles sessions internally
-    # But we use a lock to avoid potential race conditions
-    lock = threading.Lock()
-    
-    def fetch_rewards_with_shared_w3(alloc_id: str) -> tuple:
-        """Fetch rewards using the shared Web3 instance"""
+    results: Dict[str, Optional[float]] = {alloc_id: None for alloc_id in allocation_ids}
+    if not allocation_ids:
+        return results
+
+    session = _get_session()
+    selector = GET_REWARDS_SELECTOR[2:]
+    # selector + issuer is identical for every allocation; encode it once.
+    # SubgraphService first: post-Horizon allocations accrue there
+    issuer_prefixes = [
+        "0x" + selector + issuer[2:].lower().zfill(64)
+        for issuer in (SUBGRAPH_SERVICE, STAKING)
+    ]
+
+    # Two calls per allocation (one per rewards issuer), chunked so a single
+    # batch stays within typical RPC provider limits
+    batch_size = 50
+    for i in range(0, len(allocation_ids), batch_size):
+        chunk = allocation_ids[i:i + batch_size]
+        payload = []
+        call_map = {}
+        for j, alloc_id in enumerate(chunk):
+            alloc_encoded = alloc_id[2:].lower().zfill(64)
+            for k, prefix in enumerate(issuer_prefixes):
+                call_id = j * len(issuer_prefixes) + k
+                payload.append({
+                    "jsonrpc": "2.0",
+                    "method": "eth_call",
+                    "params": [{"to": REWARDS_MANAGER, "data": prefix + alloc_encoded}, "latest"],
+                    "id": call_id,
+                })
+                call_map[call_id] = alloc_id
+
         try:
-            for issuer in [STAKING, SUBGRAPH_SERVICE]:
-                try:
-                    calldata = selector + issuer[2:].lower().zfill(64) + alloc_id[2:].lower().zfill(64)
-                    result = w3.eth.call({
-                        "to": Web3.to_checksum_address(REWARDS_MANAGER),
-                        "data": f"0x{calldata}"
-                    })
-                    rewards_wei = int(result.hex(), 16)
-                    if rewards_wei > 0:
-                        return (alloc_id, rewards_wei / (10 ** GRT_DECIMALS))
-                except:
-                    continue
-            return (alloc_id, 0.0)
+            response = session.post(rpc_url, json=payload, timeout=30)
+            response.raise_for_status()
+            items = response.json()
         except Exception:
-            return (alloc_id, None)
-    
-    # Limit workers to avoid "too many open files" errors
-    effective_workers = min(max_workers, 5)
-    
-    with ThreadPoolExecutor(max_workers=effective_workers) as executor:
-        futures = {
-            executor.submit(fetch_rewards_with_shared_w3, alloc_id): alloc_id
-            for alloc_id in allocation_ids
-        }
-        
-        for future in as_completed(futures):
-            try:
-                alloc_id, rewards = future.result()
-                results[alloc_id] = rewards
-            except Exception:
-                alloc_id = futures[future]
-                results[alloc_id] = None
-    
+            continue
+        if not isinstance(items, list):
+            continue
+
+        # Any answered call counts; prefer the issuer that reports rewards
+        per_alloc: Dict[str, float] = {}
+        for item in items:
+            if not isinstance(item, dict) or "error" in item:
+                continue
+            alloc_id = call_map.get(item.get("id"))
+            if alloc_id is None:
+                continue
+            result_hex = item.get("result")
+            if not result_hex or result_hex == "0x":
+                continue
+            rewards_wei = int.from_bytes(bytes.fromhex(result_hex[2:]), "big")
+            if rewards_wei > 0 or alloc_id not in per_alloc:
+                per_alloc[alloc_id] = rewards_wei / (10 ** GRT_DECIMALS)
+        results.update(per_alloc)
+
     return results
 
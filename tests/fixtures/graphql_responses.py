@@ -265,6 +265,34 @@ SUBGRAPH_DEPLOYMENT_NOT_FOUND = {
 }
 
 
+# =============================================================================
+# ENS SUBGRAPH RESPONSES
+# =============================================================================
+
+ENS_DOMAIN_FOUND = {
+    "data": {
+        "domains": [
+            {
+                "name": "ellipfra.eth",
+                "resolvedAddress": {"id": "0xf92f430dd8567b0d466358c79594ab58d919a6d4"}
+            }
+        ]
+    }
+}
+
+ENS_DOMAINS_EMPTY = {
+    "data": {
+        "domains": []
+    }
+}
+
+ENS_RATE_LIMITED = {
+    "errors": [
+        {"message": "Too many requests, retry in 1s"}
+    ]
+}
+
+
 # =============================================================================
 # ERROR RESPONSES
 # =============================================================================
@@ -143,6 +143,33 @@ MULTICALL_MIXED_REWARDS = create_multicall_result([
 ])
 
 
+# =============================================================================
+# JSON-RPC BATCH RESPONSES (for batched eth_call)
+# =============================================================================
+
+def create_batch_eth_call_response(results: dict):
+    """Create a JSON-RPC batch response mapping call id to a uint256 result
+
+    Pass an Exception-free int for a successful call, or None for a call
+    the node answered with an error object.
+    """
+    items = []
+    for call_id, amount in results.items():
+        if amount is None:
+            items.append({
+                "jsonrpc": "2.0",
+                "id": call_id,
+                "error": {"code": -32000, "message": "execution reverted"}
+            })
+        else:
+            items.append({
+                "jsonrpc": "2.0",
+                "id": call_id,
+                "result": "0x" + hex(amount)[2:].zfill(64)
+            })
+    return items
+
+
 # =============================================================================
 # INDEXER STATUS ENDPOINT RESPONSES
 # =============================================================================
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the ENS client's caching and batch paging behavior
+
+The cache must never record a negative result for a failed query (or the
+failure sticks for the whole TTL), and batch resolution must page the
+address list so the subgraph's result limit cannot truncate a page.
+"""
+
+import json
+import re
+import sys
+import os
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fixtures.graphql_responses import ENS_DOMAIN_FOUND, ENS_DOMAINS_EMPTY
+
+import ens_client
+from ens_client import ENSClient
+
+ADDRESS = "0xf92f430dd8567b0d466358c79594ab58d919a6d4"
+
+
+def _make_client(tmp_path):
+    """Create an ENSClient whose cache file lives under tmp_path"""
+    with patch('ens_client.Path.home', return_value=tmp_path):
+        return ENSClient("https://example.com/ens")
+
+
+class TestResolveAddressCaching:
+    """Tests for single-address resolution and the negative cache"""
+
+    def test_resolved_name_is_cached(self, tmp_path):
+        client = _make_client(tmp_path)
+        with patch.object(client, 'query', return_value=ENS_DOMAIN_FOUND["data"]) as mock_query:
+            assert client.resolve_address(ADDRESS) == "ellipfra.eth"
+            # Second lookup is served from the cache
+            assert client.resolve_address(ADDRESS) == "ellipfra.eth"
+            assert mock_query.call_count == 1
+
+    def test_genuine_negative_result_is_cached(self, tmp_path):
+        client = _make_client(tmp_path)
+        with patch.object(client, 'query', return_value=ENS_DOMAINS_EMPTY["data"]) as mock_query:
+            assert client.resolve_address(ADDRESS) is None
+            assert client.resolve_address(ADDRESS) is None
+            assert mock_query.call_count == 1
+        assert client._cache[ADDRESS][0] is None
+
+    def test_failed_query_is_not_negative_cached(self, tmp_path):
+        """query() returns {} on transport errors and rate limits"""
+        client = _make_client(tmp_path)
+        with patch.object(client, 'query', return_value={}):
+            assert client.resolve_address(ADDRESS) is None
+        assert ADDRESS not in client._cache
+
+    def test_lookups_defer_the_disk_write_to_the_flush(self, tmp_path):
+        """Resolving only marks the cache dirty; _save_cache (registered
+        via atexit in normal runs) performs the single disk write"""
+        client = _make_client(tmp_path)
+        with patch.object(client, 'query', return_value=ENS_DOMAIN_FOUND["data"]):
+            client.resolve_address(ADDRESS)
+        assert client._dirty
+        assert not client._cache_file.exists()
+        client._save_cache()
+        assert not client._dirty
+        saved = json.loads(client._cache_file.read_text())
+        assert saved[ADDRESS][0] == "ellipfra.eth"
+
+
+class TestResolveAddressesBatch:
+    """Tests for batch resolution paging and caching"""
+
+    def test_pages_in_chunks_of_100(self, tmp_path):
+        client = _make_client(tmp_path)
+        addresses = ["0x" + hex(i)[2:].zfill(40) for i in range(250)]
+        with patch.object(client, 'query', return_value=ENS_DOMAINS_EMPTY["data"]) as mock_query:
+            client.resolve_addresses_batch(addresses)
+        chunk_sizes = [
+            len(call.args[1]['addresses']) for call in mock_query.call_args_list
+        ]
+        assert chunk_sizes == [100, 100, 50]
+
+    def test_query_limit_exceeds_page_size(self):
+        """One address can resolve several domains, so the domain limit
+        must sit well above the 100-address page or real matches get
+        pushed past the cutoff and negative-cached"""
+        match = re.search(r'first:\s*(\d+)', ens_client._RESOLVE_ADDRESSES_QUERY)
+        assert match and int(match.group(1)) > 100
+
+    def test_caches_names_and_genuine_negatives(self, tmp_path):
+        client = _make_client(tmp_path)
+        other = "0x1234567890abcdef1234567890abcdef12345678"
+        with patch.object(client, 'query', return_value=ENS_DOMAIN_FOUND["data"]):
+            results = client.resolve_addresses_batch([ADDRESS, other])
+        assert results == {ADDRESS: "ellipfra.eth", other: None}
+        assert client._cache[ADDRESS][0] == "ellipfra.eth"
+        assert client._cache[other][0] is None
+
+    def test_failed_chunk_is_not_negative_cached(self, tmp_path):
+        client = _make_client(tmp_path)
+        with patch.object(client, 'query', return_value={}):
+            results = client.resolve_addresses_batch([ADDRESS])
+        assert results == {}
+        assert ADDRESS not in client._cache
+
+    def test_cached_addresses_skip_the_query(self, tmp_path):
+        client = _make_client(tmp_path)
+        with patch.object(client, 'query', return_value=ENS_DOMAIN_FOUND["data"]) as mock_query:
+            client.resolve_addresses_batch([ADDRESS])
+            results = client.resolve_addresses_batch([ADDRESS])
+            assert mock_query.call_count == 1
+        assert results == {ADDRESS: "ellipfra.eth"}
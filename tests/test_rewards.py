@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the rewards module's batched eth_call path
+
+These tests drive get_rewards_batch with canned JSON-RPC batch responses
+and assert on the calldata it sends, so a wrong selector or encoding is
+caught without a live RPC endpoint.
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fixtures.rpc_responses import create_batch_eth_call_response
+
+import rewards
+from contracts import (
+    REWARDS_MANAGER, STAKING, SUBGRAPH_SERVICE, GET_REWARDS_SELECTOR
+)
+
+ALLOCATION_ID = "0xa110c11111111111111111111111111111111111"
+
+
+def _mock_session(batch_response):
+    """Build a mock session whose post() returns the given batch response"""
+    session = Mock()
+    response = Mock()
+    response.raise_for_status = Mock()
+    response.json.return_value = batch_response
+    session.post.return_value = response
+    return session
+
+
+class TestGetRewardsBatch:
+    """Tests for get_rewards_batch"""
+
+    def test_empty_input_returns_empty_dict(self):
+        assert rewards.get_rewards_batch([]) == {}
+
+    def test_calldata_uses_get_rewards_selector(self):
+        """Every eth_call must target getRewards(address,address)"""
+        session = _mock_session(create_batch_eth_call_response({0: 0, 1: 0}))
+        with patch.object(rewards, '_get_session', return_value=session):
+            rewards.get_rewards_batch([ALLOCATION_ID])
+
+        payload = session.post.call_args.kwargs['json']
+        # One call per rewards issuer
+        assert len(payload) == 2
+        for call in payload:
+            assert call['method'] == 'eth_call'
+            assert call['params'][0]['to'] == REWARDS_MANAGER
+            assert call['params'][0]['data'].startswith(GET_REWARDS_SELECTOR)
+
+    def test_calldata_encodes_issuer_and_allocation(self):
+        """Calldata is selector + padded issuer + padded allocation"""
+        session = _mock_session(create_batch_eth_call_response({0: 0, 1: 0}))
+        with patch.object(rewards, '_get_session', return_value=session):
+            rewards.get_rewards_batch([ALLOCATION_ID])
+
+        payload = session.post.call_args.kwargs['json']
+        alloc_encoded = ALLOCATION_ID[2:].lower().zfill(64)
+        sent_data = {call['params'][0]['data'] for call in payload}
+        expected = {
+            GET_REWARDS_SELECTOR + issuer[2:].lower().zfill(64) + alloc_encoded
+            for issuer in (SUBGRAPH_SERVICE, STAKING)
+        }
+        assert sent_data == expected
+
+    def test_parses_rewards_from_batch_response(self):
+        """A nonzero result for either issuer yields the GRT amount"""
+        # id 0 = SubgraphService call, id 1 = Staking call
+        session = _mock_session(create_batch_eth_call_response({
+            0: 25000 * 10 ** 18,
+            1: 0,
+        }))
+        with patch.object(rewards, '_get_session', return_value=session):
+            result = rewards.get_rewards_batch([ALLOCATION_ID])
+
+        assert result[ALLOCATION_ID] == pytest.approx(25000.0)
+
+    def test_prefers_issuer_that_reports_rewards(self):
+        """Rewards on the legacy Staking issuer are not masked by a zero"""
+        session = _mock_session(create_batch_eth_call_response({
+            0: 0,
+            1: 50000 * 10 ** 18,
+        }))
+        with patch.object(rewards, '_get_session', return_value=session):
+            result = rewards.get_rewards_batch([ALLOCATION_ID])
+
+        assert result[ALLOCATION_ID] == pytest.approx(50000.0)
+
+    def test_error_entries_leave_allocation_unresolved(self):
+        """If both calls error, the allocation stays None"""
+        session = _mock_session(create_batch_eth_call_response({
+            0: None,
+            1: None,
+        }))
+        with patch.object(rewards, '_get_session', return_value=session):
+            result = rewards.get_rewards_batch([ALLOCATION_ID])
+
+        assert result[ALLOCATION_ID] is None
+
+    def test_transport_failure_returns_all_none(self):
+        """A failed HTTP request yields None for every allocation"""
+        session = Mock()
+        session.post.side_effect = Exception("connection refused")
+        with patch.object(rewards, '_get_session', return_value=session):
+            result = rewards.get_rewards_batch([ALLOCATION_ID])
+
+        assert result == {ALLOCATION_ID: None}